@@ -675,7 +675,7 @@ jobs:
     
     - name: Install dependencies
       run: |
-        pip install selenium pandas openpyxl matplotlib
+        pip install selenium pandas openpyxl python-calamine pyarrow matplotlib requests
         pip install webdriver-manager
     
     - name: Run scraper
@@ -4,10 +4,9 @@ JOE Market Tracker - Interactive Web Application
 Tracks job openings for economists with automatic daily updates.
 """
 
-import os
 import json
 import time
-from datetime import datetime, timedelta, date
+from datetime import datetime
 from pathlib import Path
 import threading
 import schedule
@@ -15,7 +14,7 @@ import schedule
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+import plotly.io as pio
 import numpy as np
 
 # Set page config
@@ -64,6 +63,25 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# ISO weeks plotted for each academic year: roughly August through December
+WEEKS_RANGE = np.arange(30, 54)
+
+# Dark chart styling shared by every figure, layered over Plotly's default template
+pio.templates['joe_dark'] = go.layout.Template(pio.templates['plotly'])
+pio.templates['joe_dark'].layout.update(dict(
+    plot_bgcolor='#1a1a1a',
+    paper_bgcolor='#1a1a1a',
+    font=dict(color='white'),
+    xaxis=dict(gridcolor='#404040', color='white'),
+    yaxis=dict(gridcolor='#404040', color='white'),
+    legend=dict(
+        bgcolor='#2a2a2a',
+        bordercolor='#555',
+        borderwidth=1,
+        font={'color': 'white'}
+    )
+))
+
 
 class JOETracker:
     """Main application class for JOE tracking."""
@@ -100,17 +118,22 @@ class JOETracker:
             st.session_state.auto_updater_started = True
             self.start_auto_updater()
     
-    @st.cache_data(ttl=3600)
+    @st.cache_resource(ttl=3600)
     def load_data(_self) -> pd.DataFrame:
-        """Load and cache all data."""
+        """Load and cache all data (shared across reruns, so callers must not mutate it)."""
+        from process_xls_with_openings import load_listings
+        
         all_data = []
+        sources = []
         
         if _self.data_dir.exists():
             for xlsx_file in _self.data_dir.glob("*.xlsx"):
                 try:
-                    df = pd.read_excel(xlsx_file)
+                    # Columnar Parquet copy (with position counts) when current, calamine otherwise
+                    df = load_listings(str(xlsx_file))
                     df['source_file'] = xlsx_file.name
                     all_data.append(df)
+                    sources.append((xlsx_file.name, xlsx_file.stat().st_mtime_ns))
                 except Exception as e:
                     st.warning(f"Could not load {xlsx_file.name}: {e}")
         
@@ -119,15 +142,27 @@ class JOETracker:
             
             # Process dates and add calculated fields
             combined_df['Date_Active'] = pd.to_datetime(combined_df['Date_Active'])
-            combined_df['iso_year'] = combined_df['Date_Active'].dt.isocalendar().year
-            combined_df['iso_week'] = combined_df['Date_Active'].dt.isocalendar().week
-            combined_df['academic_year'] = combined_df['Date_Active'].apply(
-                lambda x: x.year if x.month >= 8 else x.year - 1
-            )
+            dates = combined_df['Date_Active'].dt
+            iso = dates.isocalendar()
+            combined_df['iso_year'] = iso['year'].astype('Int16')
+            combined_df['iso_week'] = iso['week'].astype('Int8')
+            # Academic years start in August
+            combined_df['academic_year'] = (dates.year - (dates.month < 8)).astype('Int16')
+            combined_df.attrs['years_desc'] = sorted(combined_df['academic_year'].dropna().unique().tolist(), reverse=True)
+            # Identifies the loaded files, for caches that key on filters rather than rows
+            combined_df.attrs['data_version'] = repr(sorted(sources))
             
-            # Extract position counts
-            from process_xls_with_openings import extract_position_count
-            combined_df['position_count'] = combined_df.apply(extract_position_count, axis=1)
+            # Map each distinct section label to its sidebar key once, so filtering is a plain comparison
+            section_keys = {
+                label: next((key for key, name in _self.sections.items() if name.lower() in label.lower()), None)
+                for label in combined_df['jp_section'].dropna().unique()
+            }
+            combined_df['section_key'] = combined_df['jp_section'].map(section_keys).astype('category')
+            
+            # Counts are capped at 10 and institutions/sections repeat heavily
+            combined_df['position_count'] = combined_df['position_count'].astype('int8')
+            combined_df['jp_institution'] = combined_df['jp_institution'].astype('category')
+            combined_df['jp_section'] = combined_df['jp_section'].astype('category')
             
             return combined_df
         
@@ -140,18 +175,22 @@ class JOETracker:
                 return json.load(f)
         return {'last_update': None, 'last_scrape': None}
     
-    def create_main_plot(self, df: pd.DataFrame, selected_years: list, selected_section: str) -> go.Figure:
-        """Create the main cumulative plot."""
-        
-        # Filter by section
-        if selected_section != "All Sections":
-            section_filter = self.sections.get(selected_section, selected_section)
-            df = df[df['jp_section'].str.contains(section_filter, na=False, case=False)]
+    def filter_section(self, df: pd.DataFrame, selected_section: str) -> pd.DataFrame:
+        """Return the listings in the selected section."""
+        if selected_section == "All Sections":
+            return df
         
-        # Get current date info
-        today = datetime.now()
-        current_week = today.isocalendar()[1]
-        current_year = today.year
+        return df[df['section_key'] == selected_section]
+    
+    def weekly_openings(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Sum openings into an academic year x ISO week table."""
+        return df.groupby(['academic_year', 'iso_week'])['position_count'].sum().unstack(fill_value=0)
+    
+    # The weekly table is small, so hashing it as the cache key is cheap
+    @st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+    def create_main_plot(_self, weekly: pd.DataFrame, selected_years: list, selected_section: str,
+                         current_year: int, current_week: int, current_month: int) -> go.Figure:
+        """Create the main cumulative plot (date parts are arguments so they key the cache)."""
         
         # Create figure with dark theme
         fig = go.Figure()
@@ -161,26 +200,15 @@ class JOETracker:
         
         # Plot each selected year
         for ac_year in sorted(selected_years, reverse=True):
-            year_data = df[df['academic_year'] == ac_year]
-            
-            if len(year_data) == 0:
+            if ac_year not in weekly.index:
                 continue
             
-            # Count openings by ISO week
-            week_openings = year_data.groupby('iso_week')['position_count'].sum()
-            
-            # Create cumulative from week 30 onwards (roughly August)
-            weeks = list(range(30, 54))  # Through December
-            cumulative = []
-            total_so_far = 0
-            
-            for week in weeks:
-                if week in week_openings.index:
-                    total_so_far += week_openings[week]
-                cumulative.append(total_so_far)
+            # Create cumulative from week 30 onwards
+            weeks = WEEKS_RANGE
+            cumulative = weekly.loc[ac_year].reindex(weeks, fill_value=0).to_numpy().cumsum()
             
             # For current year, only show completed weeks
-            if ac_year == current_year - 1 or (ac_year == current_year and today.month < 8):
+            if ac_year == current_year - 1 or (ac_year == current_year and current_month < 8):
                 # This is the current academic year
                 weeks_to_show = min(current_week - 30 + 1, len(weeks))
                 if weeks_to_show > 0:
@@ -192,12 +220,12 @@ class JOETracker:
             else:
                 label = str(ac_year)
             
-            max_value = max(max_value, max(cumulative) if cumulative else 0)
+            max_value = max(max_value, cumulative[-1])
             
             # Add trace
-            color = self.colors.get(ac_year, '#888888')
+            color = _self.colors.get(ac_year, '#888888')
             
-            fig.add_trace(go.Scatter(
+            fig.add_trace(go.Scattergl(
                 x=weeks,
                 y=cumulative,
                 mode='lines+markers',
@@ -216,27 +244,15 @@ class JOETracker:
                 'xanchor': 'center',
                 'font': {'color': 'white'}
             },
+            template='joe_dark',
             xaxis_title='Week of Year (ISO)',
             yaxis_title='Number of Openings (Cumulative)',
-            plot_bgcolor='#1a1a1a',
-            paper_bgcolor='#1a1a1a',
-            font=dict(color='white'),
             xaxis=dict(
-                gridcolor='#404040',
                 range=[29, 54],
-                dtick=2,
-                color='white'
+                dtick=2
             ),
             yaxis=dict(
-                gridcolor='#404040',
-                range=[0, max_value * 1.1] if max_value > 0 else [0, 100],
-                color='white'
-            ),
-            legend=dict(
-                bgcolor='#2a2a2a',
-                bordercolor='#555',
-                borderwidth=1,
-                font={'color': 'white'}
+                range=[0, max_value * 1.1] if max_value > 0 else [0, 100]
             ),
             hovermode='x unified',
             height=600
@@ -264,25 +280,22 @@ class JOETracker:
         
         return fig
     
-    def create_comparison_chart(self, df: pd.DataFrame, selected_years: list, selected_section: str) -> go.Figure:
+    @st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+    def create_comparison_chart(_self, weekly: pd.DataFrame, selected_years: list, selected_section: str,
+                                current_week: int) -> go.Figure:
         """Create year-over-year comparison at current week."""
         
-        # Filter by section
-        if selected_section != "All Sections":
-            section_filter = self.sections.get(selected_section, selected_section)
-            df = df[df['jp_section'].str.contains(section_filter, na=False, case=False)]
-        
-        current_week = datetime.now().isocalendar()[1]
+        # Openings per year through the current week
+        totals = weekly.loc[:, weekly.columns <= current_week].sum(axis=1)
         
         comparison_data = []
         for ac_year in selected_years:
-            year_df = df[(df['academic_year'] == ac_year) & (df['iso_week'] <= current_week)]
-            if len(year_df) > 0:
-                total_openings = year_df['position_count'].sum()
+            total_openings = totals.get(ac_year, 0)
+            if total_openings > 0:
                 comparison_data.append({
                     'Year': ac_year,
                     'Openings': total_openings,
-                    'Color': self.colors.get(ac_year, '#888888')
+                    'Color': _self.colors.get(ac_year, '#888888')
                 })
         
         if comparison_data:
@@ -301,13 +314,9 @@ class JOETracker:
             
             fig.update_layout(
                 title=f'Total Openings by Week {current_week}',
+                template='joe_dark',
                 xaxis_title='Academic Year',
                 yaxis_title='Total Openings',
-                plot_bgcolor='#1a1a1a',
-                paper_bgcolor='#1a1a1a',
-                font=dict(color='white'),
-                xaxis=dict(gridcolor='#404040', color='white'),
-                yaxis=dict(gridcolor='#404040', color='white'),
                 showlegend=False,
                 height=400
             )
@@ -316,6 +325,14 @@ class JOETracker:
         
         return None
     
+    # Keyed on the filters and the loaded files' version rather than the frame, so a
+    # cache hit skips hashing the rows but reloaded data is never served stale
+    @st.cache_data(ttl=3600, max_entries=8, show_spinner=False)
+    def export_csv(_self, _df: pd.DataFrame, selected_section: str, selected_years: tuple, n_rows: int,
+                   data_version: str) -> bytes:
+        """Serialize the filtered listings for download."""
+        return _df.to_csv(index=False).encode('utf-8')
+    
     def start_auto_updater(self):
         """Start the auto-updater thread for 5pm daily updates."""
         def run_updater():
@@ -337,13 +354,15 @@ class JOETracker:
             
             # Download latest 2025 data
             scraper = JOEWorkingScraper(headless=True)
-            scraper.setup_driver()
             
             current_year = datetime.now().year
             period = f"August 1, {current_year} - January 31, {current_year + 1}"
             
-            # Download US Academic
-            scraper.download_data(period, "1")
+            # Download US Academic (the scraper starts its browser on demand)
+            try:
+                scraper.download_data(period, "1")
+            finally:
+                scraper.close()
             
             # Update metadata
             metadata = {
@@ -355,13 +374,14 @@ class JOETracker:
             with open(self.metadata_file, 'w') as f:
                 json.dump(metadata, f)
             
-            # Clear cache to reload data
+            # Clear caches to reload data
+            st.cache_resource.clear()
             st.cache_data.clear()
             
         except Exception as e:
             print(f"Auto-update failed: {e}")
     
-    def render_sidebar(self) -> dict:
+    def render_sidebar(self, years_desc: list) -> dict:
         """Render sidebar with filters."""
         st.sidebar.title("🎓 JOE Market Tracker")
         st.sidebar.markdown("---")
@@ -379,7 +399,7 @@ class JOETracker:
         
         # Year selection
         st.sidebar.subheader("Select Years")
-        available_years = list(range(2019, datetime.now().year + 1))
+        available_years = [year for year in reversed(years_desc) if year >= 2019]
         
         # Default to last 3 years
         default_years = available_years[-3:] if len(available_years) >= 3 else available_years
@@ -424,49 +444,51 @@ class JOETracker:
             return
         
         # Get filters from sidebar
-        filters = self.render_sidebar()
+        filters = self.render_sidebar(df.attrs['years_desc'])
         
         if not filters['years']:
             st.warning("Please select at least one year to display.")
             return
         
-        # Display metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        # Filter data for metrics
-        metric_df = df[df['academic_year'].isin(filters['years'])]
-        if filters['section'] != "All Sections":
-            section_filter = self.sections.get(filters['section'], filters['section'])
-            metric_df = metric_df[metric_df['jp_section'].str.contains(section_filter, na=False, case=False)]
-        
-        with col1:
-            total_openings = metric_df['position_count'].sum()
-            st.metric("Total Openings", f"{total_openings:,}")
-        
-        with col2:
-            total_postings = len(metric_df)
-            st.metric("Total Postings", f"{total_postings:,}")
-        
-        with col3:
-            if total_postings > 0:
-                avg_per_posting = total_openings / total_postings
-                st.metric("Avg Openings/Posting", f"{avg_per_posting:.2f}")
-            else:
-                st.metric("Avg Openings/Posting", "N/A")
+        # Filter by section once; the charts need every year, the metrics only the selected ones
+        section_df = self.filter_section(df, filters['section'])
+        metric_df = section_df[section_df['academic_year'].isin(filters['years'])]
+        
+        # Weekly totals shared by the metrics and both charts
+        weekly = self.weekly_openings(section_df)
+        
+        total_openings = int(weekly[weekly.index.isin(filters['years'])].to_numpy().sum())
+        total_postings = len(metric_df)
+        avg_per_posting = f"{total_openings / total_postings:.2f}" if total_postings > 0 else "N/A"
+        unique_institutions = metric_df['jp_institution'].cat.remove_unused_categories().cat.categories.size
+        
+        # Display metrics as one row of cards in a single element
+        cards = "".join(
+            f'<div class="metric-card" style="flex: 1"><div class="metric-value">{value}</div>'
+            f'<div class="metric-label">{label}</div></div>'
+            for label, value in [
+                ("Total Openings", f"{total_openings:,}"),
+                ("Total Postings", f"{total_postings:,}"),
+                ("Avg Openings/Posting", avg_per_posting),
+                ("Institutions Hiring", f"{unique_institutions:,}"),
+            ]
+        )
+        st.markdown(f'<div style="display: flex; gap: 12px">{cards}</div>', unsafe_allow_html=True)
         
-        with col4:
-            unique_institutions = metric_df['jp_institution'].nunique()
-            st.metric("Institutions Hiring", f"{unique_institutions:,}")
+        # Current date parts are passed in, so cached figures roll over with the week
+        today = datetime.now()
+        current_week = today.isocalendar()[1]
         
         # Main visualization
         st.subheader("Weekly Cumulative Openings")
-        main_fig = self.create_main_plot(df, filters['years'], filters['section'])
+        main_fig = self.create_main_plot(weekly, filters['years'], filters['section'],
+                                         today.year, current_week, today.month)
         st.plotly_chart(main_fig, use_container_width=True)
         
         # Comparison chart
         if len(filters['years']) > 1:
             st.subheader("Year-over-Year Comparison")
-            comp_fig = self.create_comparison_chart(df, filters['years'], filters['section'])
+            comp_fig = self.create_comparison_chart(weekly, filters['years'], filters['section'], current_week)
             if comp_fig:
                 st.plotly_chart(comp_fig, use_container_width=True)
         
@@ -478,7 +500,8 @@ class JOETracker:
         
         # Download button
         st.markdown("---")
-        csv = metric_df.to_csv(index=False)
+        csv = self.export_csv(metric_df, filters['section'], tuple(filters['years']), len(metric_df),
+                              df.attrs['data_version'])
         st.download_button(
             label="📥 Download Data as CSV",
             data=csv,
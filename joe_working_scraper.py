@@ -5,11 +5,19 @@ Working JOE scraper based on actual HTML structure analysis.
 
 import os
 import sys
+import errno
+import hashlib
 import time
+import shutil
+import random
+import queue
 import logging
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from pathlib import Path
 import json
+import re
 from typing import Optional, Dict, List
 
 from selenium import webdriver
@@ -17,13 +25,88 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, ElementClickInterceptedException
+from selenium.common.exceptions import (TimeoutException, ElementClickInterceptedException,
+                                        StaleElementReferenceException, WebDriverException)
 from selenium.webdriver.common.action_chains import ActionChains
 import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import urllib3.exceptions
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import PatternMatchingEventHandler
+except ImportError:  # watchdog is optional; fall back to polling
+    Observer = None
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+LISTINGS_URL = "https://www.aeaweb.org/joe/listings"
+
+# Listings page locators, built once. CSS is matched natively by Chrome; the
+# text-labelled controls are found by class and filtered on their text in Python
+_LOCATOR_COOKIE_BUTTONS = (By.CSS_SELECTOR, "button[class*='cookie'], a[class*='cookie']")
+_LOCATOR_OPTIONS_BUTTONS = (By.CSS_SELECTOR, "div.options-button")
+_LOCATOR_SHOW_ALL = (By.CSS_SELECTOR, "input[type='checkbox'][value='0']")
+_SECTION_CHECKBOX_CSS = "input[type='checkbox'][value='{}']"
+_LOCATOR_BUTTONS = (By.TAG_NAME, "button")
+_LOCATOR_RESULTS_SELECT = (By.CSS_SELECTOR, "select[class*='results-per-page'], select[name*='results']")
+_LOCATOR_EXTRA_BUTTONS = (By.CSS_SELECTOR, "div.extra-button-wrapper")
+_NATIVE_XLS_CSS = "a[href*='resultset_xls_output.php']"
+_LOCATOR_NATIVE_XLS = (By.CSS_SELECTOR, _NATIVE_XLS_CSS)
+_SCRIPT_NATIVE_XLS_URL = (
+    f"var link = document.querySelector(\"{_NATIVE_XLS_CSS}\");"
+    "return link ? link.href : null;")
+
+# Removes the cookie banner and its overlay; returns how many elements it removed
+_SCRIPT_REMOVE_COOKIE_BANNER = (
+    "var banners = document.querySelectorAll('.cookie-legal-banner, .cookie-overlay, .cookie-banner');"
+    "banners.forEach(function (e) { e.remove(); });"
+    "return banners.length;")
+
+# Requests the listings page never needs (stylesheets stay: clickability depends on layout)
+_BLOCKED_URLS = [
+    "*.woff", "*.woff2", "*.ttf", "*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg",
+    "*googletagmanager*", "*google-analytics*", "*doubleclick*",
+]
+
+# Start year of a period such as "August 1, 2024 - January 31, 2025"
+_PERIOD_RE = re.compile(r",\s*(\d{4})")
+
+
+def _clickable_with_text(locator, text):
+    """Wait condition: the first visible, enabled element at locator whose text contains text."""
+    def condition(driver):
+        for element in driver.find_elements(*locator):
+            try:
+                if text in element.text and element.is_displayed() and element.is_enabled():
+                    return element
+            except StaleElementReferenceException:
+                continue  # Re-rendered while we looked; the next poll sees the new one
+        return False
+    return condition
+
+
+class RateLimiter:
+    """Enforce a minimum interval (plus random jitter) between actions, shared across threads."""
+    
+    def __init__(self, interval: float, jitter: float = 0.0):
+        self.interval = interval
+        self.jitter = jitter
+        self.lock = threading.Lock()
+        self.next_time = 0.0
+    
+    def wait(self):
+        """Block until the next action is allowed."""
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval + random.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
 
 class JOEWorkingScraper:
     """Working scraper based on actual HTML structure."""
@@ -51,7 +134,38 @@ class JOEWorkingScraper:
         "9": "Full-Time Nonacademic",
     }
     
-    def __init__(self, download_dir: str = None, headless: bool = False):
+    # Lookups derived once from the tables above: display names, file name slugs
+    # and start years (None is the unfiltered, all-sections download)
+    SECTION_NAMES = {None: "All Sections", **SECTIONS}
+    SECTION_SLUGS = {None: "all_sections",
+                     **{value: name.replace(":", "").replace(" ", "_") for value, name in SECTIONS.items()}}
+    PERIOD_YEAR = {period: _PERIOD_RE.search(period).group(1) for period in DATE_PERIODS}
+    
+    # Open periods are refetched once their file is older than this; closed
+    # periods are final once this long past their end date (late edits settle)
+    CACHE_TTL = timedelta(hours=24)
+    CLOSED_GRACE = timedelta(days=30)
+    
+    # Attempts per (period, section) before giving up, with exponential backoff between them
+    MAX_ATTEMPTS = 3
+    RETRY_BACKOFF = 2.0
+    RETRY_BACKOFF_MAX = 30.0
+    
+    # Seconds between download starts: the interval plus up to DOWNLOAD_JITTER more
+    DOWNLOAD_INTERVAL = 0.5
+    DOWNLOAD_JITTER = 1.0
+    
+    # Transport-level retries for direct downloads before falling back to the browser
+    HTTP_RETRY = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                       raise_on_status=False)
+    
+    # Disk cache kept in each persistent Chrome profile
+    CHROME_DISK_CACHE_BYTES = 100 * 1024 * 1024
+    
+    # Guards the export URL cache shared by parallel workers
+    _url_cache_lock = threading.Lock()
+    
+    def __init__(self, download_dir: str = None, headless: bool = False, worker_id: int = None):
         """Initialize the scraper."""
         if download_dir is None:
             # Use scraped subfolder to keep downloads organized
@@ -59,12 +173,36 @@ class JOEWorkingScraper:
         self.download_dir = Path(download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
         
-        # Create temp download folder for browser
+        # Create temp download folder for browser (one per parallel worker)
         self.temp_download_dir = self.download_dir / 'temp'
+        if worker_id is not None:
+            self.temp_download_dir = self.temp_download_dir / f'worker_{worker_id}'
         self.temp_download_dir.mkdir(parents=True, exist_ok=True)
         
+        # Chrome profiles live next to the data so cookies and HTTP cache survive
+        # between runs; Chrome locks a profile, so each parallel worker needs its own
+        profile_name = 'main' if worker_id is None else f'worker_{worker_id}'
+        self.profile_dir = self.download_dir / '.chrome_profile' / profile_name
+        
         self.headless = headless
         self.driver = None
+        self._cookie_handled = False
+        self.wait = None
+        self.session = None
+        self.rate_limiter = RateLimiter(self.DOWNLOAD_INTERVAL, self.DOWNLOAD_JITTER)
+        
+        # Export URLs captured from the listings page, keyed by period and section
+        self.url_cache_file = self.download_dir / "xls_urls.json"
+        
+        # Listings page URL reached for each period during this run
+        self.period_urls = {}
+        
+        # Content digest of the last saved download and whether it matched the file on disk
+        self.last_download = {}
+        
+        # Finished browser downloads, fed by a filesystem observer when watchdog is installed
+        self._download_queue = queue.Queue()
+        self._observer = None
         
     def setup_driver(self):
         """Set up Chrome driver."""
@@ -75,51 +213,413 @@ class JOEWorkingScraper:
             "download.default_directory": str(self.temp_download_dir.absolute()),
             "download.prompt_for_download": False,
             "download.directory_upgrade": True,
-            "safebrowsing.enabled": True
+            "safebrowsing.enabled": True,
+            # Only the filter form and download link are needed; skip heavy resources.
+            # Stylesheets stay on because clickability checks depend on layout.
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.plugins": 2,
+            "profile.default_content_setting_values.notifications": 2
         }
         options.add_experimental_option("prefs", prefs)
         
+        # Return from driver.get() at DOMContentLoaded; explicit waits cover the rest
+        options.page_load_strategy = "eager"
+        
         if self.headless:
             options.add_argument("--headless=new")
+            options.add_argument("--disable-gpu")
             
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
         options.add_argument("--window-size=1920,1080")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument(f"--user-data-dir={self.profile_dir.absolute()}")
+        options.add_argument("--profile-directory=Default")
+        options.add_argument(f"--disk-cache-size={self.CHROME_DISK_CACHE_BYTES}")
+        
+        # Skip background services Chrome would otherwise start alongside the page
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-background-networking")
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-renderer-backgrounding")
+        options.add_argument("--disable-features=Translate,BackForwardCache,MediaRouter,AcceptCHFrame")
+        options.add_argument("--disable-sync")
+        options.add_argument("--metrics-recording-only")
+        options.add_argument("--mute-audio")
         
         self.driver = webdriver.Chrome(options=options)
-        self.driver.implicitly_wait(10)
+        self._cookie_handled = False
+        
+        # Drop fonts, images and trackers at the network layer
+        try:
+            self.driver.execute_cdp_cmd("Network.enable", {})
+            self.driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _BLOCKED_URLS})
+        except WebDriverException as e:
+            logger.warning(f"Could not block page resources: {e}")
+        
+        # Pin downloads to this scraper's temp directory for the whole browser,
+        # which the prefs alone do not guarantee in headless mode
+        try:
+            self.driver.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": str(self.temp_download_dir.absolute())
+            })
+        except WebDriverException as e:
+            logger.warning(f"Could not set download directory: {e}")
+        
+        if Observer is not None and self._observer is None:
+            self._watch_downloads()
         
+        # Explicit waits only: an implicit wait would add its full timeout to
+        # every lookup that is expected to miss
+        self.wait = WebDriverWait(self.driver, 15, poll_frequency=0.2)
+        
+    def get_driver(self):
+        """Return a live browser session, starting or restarting Chrome as needed."""
+        if self.driver is not None:
+            try:
+                self.driver.current_url  # Health check
+                return self.driver
+            except WebDriverException:
+                logger.warning("Browser session is unresponsive, restarting...")
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
+                self.driver = None
+        
+        self.setup_driver()
+        return self.driver
+    
     def wait_for_download(self, timeout: int = 30) -> Optional[str]:
         """Wait for a file to be downloaded."""
+        if self._observer is not None:
+            return self._wait_for_download_event(timeout)
+        return self._poll_for_download(timeout)
+    
+    def _watch_downloads(self):
+        """Start an observer that queues each finished download in the temp directory."""
+        def on_download(event):
+            path = getattr(event, 'dest_path', None) or event.src_path
+            if not Path(path).name.startswith('.'):
+                self._download_queue.put(path)
+        
+        # Chrome writes *.crdownload and renames it once the download finishes
+        handler = PatternMatchingEventHandler(patterns=["*.xls", "*.xlsx"],
+                                              ignore_patterns=["*.crdownload", "*.tmp"],
+                                              ignore_directories=True)
+        handler.on_created = on_download
+        handler.on_moved = on_download
+        
+        self._observer = Observer()
+        self._observer.schedule(handler, str(self.temp_download_dir), recursive=False)
+        self._observer.start()
+    
+    def _drain_download_queue(self):
+        """Discard queued events from earlier downloads."""
+        while True:
+            try:
+                self._download_queue.get_nowait()
+            except queue.Empty:
+                return
+    
+    def _wait_for_download_event(self, timeout: int) -> Optional[str]:
+        """Block on the download queue until a finished download appears."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                path = self._download_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            # Skip files that were cleaned up after the event fired
+            if os.path.exists(path):
+                logger.info(f"Download complete: {path}")
+                return path
+        
+        logger.warning("Download timeout")
+        return None
+    
+    def _finished_downloads(self):
+        """Yield finished XLS files in the temp directory as os.DirEntry objects."""
+        with os.scandir(self.temp_download_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if '.xls' in name and not name.startswith('.') and not name.endswith('.crdownload'):
+                    yield entry
+    
+    def _poll_for_download(self, timeout: int) -> Optional[str]:
+        """Poll the temp directory until a finished download appears."""
         start_time = time.time()
         
         # Check existing files first
-        existing_files = set(self.temp_download_dir.glob("*.xls*"))
+        existing_files = {entry.name for entry in self._finished_downloads()}
         
         while time.time() - start_time < timeout:
-            # Look in temp directory for downloads
-            current_files = set(self.temp_download_dir.glob("*.xls*"))
-            
-            # Check for new files (not in existing set)
-            new_files = current_files - existing_files
-            
-            for file in new_files:
-                if not file.name.startswith('.') and not file.name.endswith('.crdownload'):
-                    logger.info(f"Download complete: {file}")
-                    return str(file)
-            
-            # Also check if existing files grew in size (were being downloaded)
-            for file in current_files:
-                if file.stat().st_mtime > start_time and not file.name.startswith('.'):
-                    if not file.name.endswith('.crdownload'):
-                        logger.info(f"Download complete: {file}")
-                        return str(file)
+            # A new file, or an existing one rewritten since we started, is the download
+            for entry in self._finished_downloads():
+                if entry.name not in existing_files or entry.stat().st_mtime > start_time:
+                    logger.info(f"Download complete: {entry.path}")
+                    return entry.path
             
             time.sleep(1)
         
         logger.warning("Download timeout")
         return None
     
+    def _http_session(self) -> requests.Session:
+        """Return an HTTP session carrying the browser's current cookies, if any."""
+        if self.session is None:
+            self.session = requests.Session()
+            # Keep-alive pool with retries on throttling and server errors; requests
+            # already asks for gzip/deflate and decodes it
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=self.HTTP_RETRY)
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+            
+            # Without a browser, pick up the site's session cookies from the listings page
+            if self.driver is None:
+                try:
+                    self.session.get(LISTINGS_URL, timeout=30).close()
+                except requests.RequestException as e:
+                    logger.warning(f"Could not seed HTTP session: {e}")
+        
+        if self.driver is not None:
+            if 'Mozilla' not in self.session.headers['User-Agent']:
+                self.session.headers['User-Agent'] = self.driver.execute_script("return navigator.userAgent;")
+            for cookie in self.driver.get_cookies():
+                self.session.cookies.set(cookie['name'], cookie['value'],
+                                         domain=cookie.get('domain'), path=cookie.get('path', '/'))
+        return self.session
+    
+    def _cached_xls_url(self, period: str, section_value: str = None) -> Optional[str]:
+        """Return the export URL captured for this period and section on an earlier run."""
+        with self._url_cache_lock:
+            if not self.url_cache_file.exists():
+                return None
+            with open(self.url_cache_file) as f:
+                urls = json.load(f)
+        return urls.get(f"{period}|{section_value or 'all'}")
+    
+    def _store_xls_url(self, period: str, section_value: str, url: str):
+        """Remember the export URL for this period and section."""
+        with self._url_cache_lock:
+            urls = {}
+            if self.url_cache_file.exists():
+                with open(self.url_cache_file) as f:
+                    urls = json.load(f)
+            urls[f"{period}|{section_value or 'all'}"] = url
+            self._write_json(self.url_cache_file, urls)
+    
+    def _forget_xls_url(self, period: str, section_value: str = None):
+        """Drop a cached export URL that no longer yields an XLSX file."""
+        with self._url_cache_lock:
+            if not self.url_cache_file.exists():
+                return
+            with open(self.url_cache_file) as f:
+                urls = json.load(f)
+            if urls.pop(f"{period}|{section_value or 'all'}", None) is not None:
+                self._write_json(self.url_cache_file, urls)
+    
+    def _http_download(self, url: str) -> Optional[str]:
+        """Fetch the XLS export directly into the temp directory."""
+        temp_path = self.temp_download_dir / "joe_download.xlsx"
+        
+        try:
+            with self._http_session().get(url, stream=True, timeout=60) as response:
+                if response.status_code != 200:
+                    logger.warning(f"Direct download failed: HTTP {response.status_code}")
+                    return None
+                
+                with open(temp_path, 'wb') as f:
+                    response.raw.decode_content = True
+                    shutil.copyfileobj(response.raw, f, length=1024 * 1024)
+        except (requests.RequestException, urllib3.exceptions.HTTPError, OSError) as e:
+            # Reading response.raw raises urllib3 errors on a truncated body; drop the partial file
+            logger.warning(f"Direct download failed: {e}")
+            temp_path.unlink(missing_ok=True)
+            return None
+        
+        # XLSX files are zip archives; anything else is an error page
+        with open(temp_path, 'rb') as f:
+            if f.read(2) != b'PK':
+                logger.warning("Direct download did not return an XLSX file")
+                temp_path.unlink()
+                return None
+        
+        logger.info(f"Download complete: {temp_path}")
+        return str(temp_path)
+    
+    def _browser_download(self, native_xls_link) -> Optional[str]:
+        """Download the XLS export by clicking through the page."""
+        # Only events from this click count (the HTTP attempt may have left one)
+        self._drain_download_queue()
+        
+        # Click the Download Options div
+        download_div = self.wait.until(_clickable_with_text(_LOCATOR_EXTRA_BUTTONS, 'Download Options'))
+        download_div.click()
+        try:
+            self.wait.until(EC.visibility_of(native_xls_link))
+        except TimeoutException:
+            pass  # The JavaScript click below works on hidden links too
+        
+        # Use JavaScript to click if regular click is intercepted
+        logger.info("Clicking Native XLS...")
+        try:
+            native_xls_link.click()
+        except ElementClickInterceptedException:
+            logger.info("Click intercepted, using JavaScript click...")
+            self.driver.execute_script("arguments[0].click();", native_xls_link)
+        
+        return self.wait_for_download(timeout=60)
+    
+    def _wait_for_reload(self, element, timeout: float = 5):
+        """Wait for an element to go stale, i.e. for the page to re-render after an action."""
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.2).until(EC.staleness_of(element))
+        except TimeoutException:
+            pass  # Updated in place
+    
+    def _dismiss_cookie_banner(self):
+        """Remove the cookie banner from the current page, accepting it only as a fallback."""
+        if self._cookie_handled:
+            return
+        
+        try:
+            if self.driver.execute_script(_SCRIPT_REMOVE_COOKIE_BANNER):
+                return
+            
+            # Nothing to remove by class; accept through the banner's button so the
+            # consent cookie keeps it off later pages
+            # Only an "Accept" control: other cookie links (policy, settings) navigate away
+            accept_button = _clickable_with_text(_LOCATOR_COOKIE_BUTTONS, 'Accept')(self.driver)
+            if accept_button:
+                logger.info("Accepting cookie banner...")
+                accept_button.click()
+                self.wait.until(EC.invisibility_of_element(accept_button))
+                self._cookie_handled = True
+        except Exception as e:
+            logger.warning(f"Could not handle cookie banner: {e}")
+    
+    def _goto_period(self, period: str) -> bool:
+        """Open the listings page for a period, handling the cookie banner on the way."""
+        # Navigate to JOE listings
+        logger.info(f"Navigating to JOE listings...")
+        self.driver.get(LISTINGS_URL)
+        
+        self._dismiss_cookie_banner()
+        
+        # Step 1: Click the date period link
+        logger.info(f"Clicking date period: {period}")
+        try:
+            date_link = self.wait.until(EC.element_to_be_clickable((By.LINK_TEXT, period)))
+            date_link.click()
+            self._wait_for_reload(date_link, timeout=15)
+        except:
+            logger.warning(f"Could not find exact date link, trying partial match...")
+            # Try partial match
+            date_links = self.driver.find_elements(By.PARTIAL_LINK_TEXT, period.split("-")[0].strip())
+            if date_links:
+                date_links[0].click()
+                self._wait_for_reload(date_links[0], timeout=15)
+            else:
+                logger.error(f"Could not find date period: {period}")
+                return False
+        
+        return True
+    
+    def _fetch_with_browser(self, period: str, section_value: str = None) -> Optional[str]:
+        """Drive the listings page to the requested filters and download the export."""
+        # Reuse the running browser, starting or restarting it if needed
+        self.get_driver()
+        
+        # Sections of the same period share one listings page, so only the first
+        # visit goes through the date link
+        if period in self.period_urls:
+            logger.info(f"Reopening listings for {period}")
+            self.driver.get(self.period_urls[period])
+            self._dismiss_cookie_banner()
+        elif self._goto_period(period):
+            self.period_urls[period] = self.driver.current_url
+        else:
+            return None
+        
+        # Step 2: Apply section filter if specified
+        if section_value:
+            logger.info(f"Applying section filter: {section_value}")
+            
+            # Click Section/Type to expand options
+            section_button = self.wait.until(_clickable_with_text(_LOCATOR_OPTIONS_BUTTONS, 'Section/Type'))
+            section_button.click()
+            
+            # The options are open once the section's checkbox is clickable
+            section_checkbox = self.wait.until(EC.element_to_be_clickable(
+                (By.CSS_SELECTOR, _SECTION_CHECKBOX_CSS.format(section_value))))
+            
+            # Uncheck "Show All" first if it's checked
+            try:
+                show_all = self.driver.find_element(*_LOCATOR_SHOW_ALL)
+                if show_all.is_selected():
+                    show_all.click()
+                    self.wait.until(lambda driver: not show_all.is_selected())
+            except:
+                pass
+            
+            # Check the specific section
+            if not section_checkbox.is_selected():
+                section_checkbox.click()
+                logger.info(f"Selected section: {section_value}")
+            
+            # Need to click Apply Filter button for it to take effect
+            try:
+                apply_button = WebDriverWait(self.driver, 5, poll_frequency=0.2).until(
+                    _clickable_with_text(_LOCATOR_BUTTONS, 'Apply Filter'))
+                apply_button.click()
+                logger.info("Clicked Apply Filter button")
+                self._wait_for_reload(apply_button)  # Wait for filter to apply
+            except:
+                # Fallback: click outside
+                self.driver.find_element(By.TAG_NAME, "body").click()
+        
+        # Step 3: Set Results Per Page to All
+        try:
+            logger.info("Setting results per page to All...")
+            # Look for the select element
+            results_select = self.wait.until(EC.presence_of_element_located(_LOCATOR_RESULTS_SELECT))
+            select = Select(results_select)
+            
+            # Try to select "All" or the highest value
+            try:
+                select.select_by_visible_text("All")
+            except:
+                # If "All" doesn't exist, select the last option (usually the highest)
+                options = select.options
+                if options:
+                    select.select_by_index(len(options) - 1)
+            
+            self._wait_for_reload(results_select)
+        except Exception as e:
+            logger.warning(f"Could not set results to All: {e}")
+        
+        # Step 4: Download the Native XLS export
+        # The link is in the DOM even while Download Options is collapsed, so
+        # read its absolute URL in one script call and fetch it over HTTP
+        xls_url = self.wait.until(lambda driver: driver.execute_script(_SCRIPT_NATIVE_XLS_URL))
+        logger.info(f"Fetching Native XLS: {xls_url}")
+        downloaded_file = self._http_download(xls_url)
+        
+        if downloaded_file:
+            # The URL carries the filter state, so later runs can skip the browser
+            self._store_xls_url(period, section_value, xls_url)
+        else:
+            logger.info("Falling back to browser download...")
+            native_xls_link = self.driver.find_element(*_LOCATOR_NATIVE_XLS)
+            downloaded_file = self._browser_download(native_xls_link)
+        
+        return downloaded_file
+    
     def download_data(self, period: str, section_value: str = None) -> Optional[str]:
         """
         Download data for a specific period and optional section.
@@ -133,186 +633,57 @@ class JOEWorkingScraper:
         """
         try:
             # Clean temp directory before starting
-            for temp_file in self.temp_download_dir.glob("*"):
-                try:
-                    temp_file.unlink()
-                except:
-                    pass
-            
-            # Navigate to JOE listings
-            logger.info(f"Navigating to JOE listings...")
-            self.driver.get("https://www.aeaweb.org/joe/listings")
-            time.sleep(3)
-            
-            # Handle cookie banner immediately
-            try:
-                logger.info("Checking for cookie banner...")
-                # Look for cookie accept button or close button
-                cookie_buttons = self.driver.find_elements(By.XPATH, 
-                    "//button[contains(text(), 'Accept')] | " +
-                    "//button[contains(text(), 'OK')] | " +
-                    "//button[contains(text(), 'I agree')] | " +
-                    "//a[contains(@class, 'cookie') and contains(text(), 'Accept')] | " +
-                    "//button[contains(@class, 'cookie')]")
-                
-                if cookie_buttons:
-                    logger.info(f"Found cookie button, clicking...")
-                    cookie_buttons[0].click()
-                    time.sleep(1)
-                else:
-                    # Try to hide cookie banner with JavaScript
-                    self.driver.execute_script("""
-                        var cookieBanner = document.querySelector('.cookie-legal-banner');
-                        if (cookieBanner) {
-                            cookieBanner.style.display = 'none';
-                        }
-                        var cookieOverlay = document.querySelector('.cookie-overlay');
-                        if (cookieOverlay) {
-                            cookieOverlay.style.display = 'none';
-                        }
-                    """)
-            except Exception as e:
-                logger.warning(f"Could not handle cookie banner: {e}")
-            
-            # Step 1: Click the date period link
-            logger.info(f"Clicking date period: {period}")
-            try:
-                date_link = self.driver.find_element(By.LINK_TEXT, period)
-                date_link.click()
-                time.sleep(3)
-            except:
-                logger.warning(f"Could not find exact date link, trying partial match...")
-                # Try partial match
-                date_links = self.driver.find_elements(By.PARTIAL_LINK_TEXT, period.split("-")[0].strip())
-                if date_links:
-                    date_links[0].click()
-                    time.sleep(3)
-                else:
-                    logger.error(f"Could not find date period: {period}")
-                    return None
-            
-            # Step 2: Apply section filter if specified
-            if section_value:
-                logger.info(f"Applying section filter: {section_value}")
-                
-                # Click Section/Type to expand options
-                section_button = self.driver.find_element(By.XPATH, "//div[@class='options-button' and contains(text(), 'Section/Type')]")
-                section_button.click()
-                time.sleep(1)
-                
-                # Uncheck "Show All" first if it's checked
-                try:
-                    show_all = self.driver.find_element(By.XPATH, "//input[@type='checkbox' and @value='0']")
-                    if show_all.is_selected():
-                        show_all.click()
-                        time.sleep(0.5)
-                except:
-                    pass
-                
-                # Check the specific section
-                section_checkbox = self.driver.find_element(By.XPATH, f"//input[@type='checkbox' and @value='{section_value}']")
-                if not section_checkbox.is_selected():
-                    section_checkbox.click()
-                    logger.info(f"Selected section: {section_value}")
-                
-                # Need to click Apply Filter button for it to take effect
-                try:
-                    apply_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Apply Filter')]")
-                    apply_button.click()
-                    logger.info("Clicked Apply Filter button")
-                except:
-                    # Fallback: click outside
-                    self.driver.find_element(By.TAG_NAME, "body").click()
-                    
-                time.sleep(3)  # Wait for filter to apply
+            self._clear_temp()
             
-            # Step 3: Set Results Per Page to All
-            try:
-                logger.info("Setting results per page to All...")
-                # Look for the select element
-                results_select = self.driver.find_element(By.XPATH, "//select[contains(@class, 'results-per-page') or contains(@name, 'results')]")
-                select = Select(results_select)
-                
-                # Try to select "All" or the highest value
+            # Try the export URL captured on an earlier run before starting a browser
+            downloaded_file = None
+            xls_url = self._cached_xls_url(period, section_value)
+            if xls_url:
+                logger.info(f"Fetching cached Native XLS URL: {xls_url}")
                 try:
-                    select.select_by_visible_text("All")
-                except:
-                    # If "All" doesn't exist, select the last option (usually the highest)
-                    options = select.options
-                    if options:
-                        select.select_by_index(len(options) - 1)
+                    downloaded_file = self._http_download(xls_url)
+                except Exception as e:
+                    logger.warning(f"Cached Native XLS URL failed: {e}")
+                    self._clear_temp()
                 
-                time.sleep(2)
-            except Exception as e:
-                logger.warning(f"Could not set results to All: {e}")
-            
-            # Step 4: Click Download Options and then Native XLS
-            logger.info("Opening download options...")
+                # A stale entry would be replayed on every retry; the browser path re-captures it
+                if downloaded_file is None:
+                    self._forget_xls_url(period, section_value)
             
-            # Click the Download Options div
-            download_div = self.driver.find_element(By.XPATH, "//div[contains(@class, 'extra-button-wrapper') and contains(text(), 'Download Options')]")
-            download_div.click()
-            time.sleep(1)
-            
-            # Now click Native XLS link
-            logger.info("Clicking Native XLS...")
-            native_xls_link = self.driver.find_element(By.XPATH, "//a[contains(@href, 'resultset_xls_output.php')]")
-            
-            # Handle cookie banner or other overlays
-            try:
-                # Try to close cookie banner if it exists
-                cookie_close = self.driver.find_elements(By.XPATH, "//button[contains(@class, 'cookie') and contains(text(), 'Accept')] | //button[contains(@class, 'cookie-close')] | //a[contains(@class, 'cookie') and contains(text(), 'Accept')]")
-                if cookie_close:
-                    cookie_close[0].click()
-                    time.sleep(1)
-            except:
-                pass
-            
-            # Use JavaScript to click if regular click is intercepted
-            try:
-                native_xls_link.click()
-            except ElementClickInterceptedException:
-                logger.info("Click intercepted, using JavaScript click...")
-                self.driver.execute_script("arguments[0].click();", native_xls_link)
-            
-            # Wait for download
-            downloaded_file = self.wait_for_download(timeout=60)
+            if downloaded_file is None:
+                downloaded_file = self._fetch_with_browser(period, section_value)
             
             if downloaded_file:
                 # Rename with metadata
-                year = period.split(",")[1].strip().split("-")[0].strip()
-                if section_value:
-                    section_name = self.SECTIONS.get(section_value, "unknown")
-                    section_name = section_name.replace(":", "").replace(" ", "_")
-                    new_name = f"joe_{year}_{section_name}.xlsx"
-                else:
-                    # No section filter means all sections
-                    new_name = f"joe_{year}_all_sections.xlsx"
-                final_path = self.download_dir / new_name
+                final_path = self._output_path(period, section_value)
+                digest = self._file_digest(downloaded_file)
                 
-                # Move from temp to final location, overwriting if exists
-                if final_path.exists():
-                    logger.info(f"Overwriting existing file: {final_path}")
-                    final_path.unlink()
+                # Leave an identical file untouched so its mtime (and any parse cache keyed on it) stays valid
+                unchanged = (final_path.exists()
+                             and final_path.stat().st_size == os.path.getsize(downloaded_file)
+                             and self._file_digest(final_path) == digest)
+                
+                if unchanged:
+                    logger.info(f"✓ Unchanged: {final_path}")
+                else:
+                    # Move from temp to final location, overwriting if exists
+                    if final_path.exists():
+                        logger.info(f"Overwriting existing file: {final_path}")
+                    
+                    self._safe_move(downloaded_file, final_path)
+                    logger.info(f"✓ Saved as: {final_path}")
                 
-                Path(downloaded_file).rename(final_path)
-                logger.info(f"✓ Saved as: {final_path}")
+                self.last_download = {'digest': digest, 'unchanged': unchanged}
                 
                 # Clean temp directory
-                for temp_file in self.temp_download_dir.glob("*"):
-                    try:
-                        temp_file.unlink()
-                    except:
-                        pass
+                self._clear_temp()
                 
                 return str(final_path)
             
             return None
             
         except Exception as e:
-            logger.error(f"Error downloading {period}: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
+            logger.exception(f"Error downloading {period}: {e}")
             
             # Take screenshot for debugging
             try:
@@ -324,59 +695,217 @@ class JOEWorkingScraper:
             
             return None
     
-    def download_all(self, years: int = 5, sections: List[str] = None):
+    @staticmethod
+    def _write_json(file_path: Path, data):
+        """Write JSON atomically, so a crash never leaves a truncated file behind."""
+        temp_file = file_path.with_suffix('.json.tmp')
+        with open(temp_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        os.replace(temp_file, file_path)
+    
+    @staticmethod
+    def _file_digest(file_path) -> str:
+        """Return a BLAKE2b content digest of a file, read in 1 MiB chunks."""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+    
+    def _clear_temp(self):
+        """Delete leftover files in the temp directory (worker subdirectories are kept)."""
+        with os.scandir(self.temp_download_dir) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    try:
+                        os.unlink(entry.path)
+                    except OSError:
+                        pass
+    
+    @staticmethod
+    def _safe_move(src, dst):
+        """Atomically move src over dst, copying only if they are on different filesystems."""
+        try:
+            os.replace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dst)
+    
+    def _output_path(self, period: str, section_value: str = None) -> Path:
+        """Return the final file path for a period and optional section."""
+        year = self.PERIOD_YEAR.get(period)
+        if year is None:
+            match = _PERIOD_RE.search(period)
+            if not match:
+                raise ValueError(f"Unrecognized period: {period}")
+            year = match.group(1)
+        
+        # No section filter means all sections; sections without a name (e.g. 2, 6, 10
+        # from --all-sections) keep their value, so their files never collide
+        section_slug = self.SECTION_SLUGS.get(section_value or None, f"section_{section_value}")
+        return self.download_dir / f"joe_{year}_{section_slug}.xlsx"
+    
+    @classmethod
+    def _is_period_closed(cls, period: str) -> bool:
+        """Check whether a period ended long enough ago that its listings are final."""
+        end_text = re.split(r"\s*[-–]\s*", period)[-1]
+        try:
+            end_date = datetime.strptime(end_text, "%B %d, %Y")
+        except ValueError:
+            return False
+        return end_date + cls.CLOSED_GRACE < datetime.now()
+    
+    def _load_download_metadata(self) -> Dict[tuple, Dict]:
+        """Return the previous run's download entries keyed by (period, section)."""
+        metadata_file = self.download_dir / "download_metadata.json"
+        if not metadata_file.exists():
+            return {}
+        try:
+            with open(metadata_file) as f:
+                downloads = json.load(f).get('downloads', [])
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read download metadata: {e}")
+            return {}
+        return {(entry['period'], entry['section']): entry for entry in downloads}
+    
+    def download_one(self, period: str, section_value: str, index: int, total: int) -> Optional[Dict]:
+        """Download a single (period, section) pair and return its metadata entry."""
+        section_name = self.SECTION_NAMES.get(section_value or None, f"Section {section_value}")
+        
+        # Keep downloads politely spaced, across all workers
+        self.rate_limiter.wait()
+        
+        logger.info(f"\n{'='*60}")
+        logger.info(f"Downloading {index}/{total}: {period} - {section_name}")
+        logger.info(f"{'='*60}")
+        
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            file_path = self.download_data(period, section_value)
+            if file_path or attempt == self.MAX_ATTEMPTS:
+                break
+            
+            delay = min(self.RETRY_BACKOFF * 2 ** (attempt - 1), self.RETRY_BACKOFF_MAX)
+            logger.warning(f"Attempt {attempt}/{self.MAX_ATTEMPTS} failed for {period} - {section_name}, "
+                           f"retrying in {delay:.0f}s with a fresh browser")
+            
+            # A failed attempt may have left the session in a bad state
+            if self.driver is not None:
+                try:
+                    self.driver.quit()
+                except WebDriverException:
+                    pass
+                self.driver = None
+            time.sleep(delay)
+        
+        if file_path:
+            logger.info(f"✓ Success: {file_path}")
+            return {
+                'period': period,
+                'section': section_name,
+                'file': file_path,
+                'timestamp': datetime.now().isoformat(),
+                **self.last_download
+            }
+        
+        logger.error(f"✗ Failed: {period} - {section_name}")
+        return None
+    
+    def _download_parallel(self, tasks: List[tuple], workers: int) -> List[Dict]:
+        """Download tasks on a thread pool, one browser per worker thread."""
+        local = threading.local()
+        scrapers = []
+        lock = threading.Lock()
+        
+        def run(index, period, section_value):
+            scraper = getattr(local, 'scraper', None)
+            if scraper is None:
+                with lock:
+                    scraper = JOEWorkingScraper(self.download_dir, self.headless, worker_id=len(scrapers))
+                    scraper.rate_limiter = self.rate_limiter
+                    scrapers.append(scraper)
+                local.scraper = scraper
+            return index, scraper.download_one(period, section_value, index, len(tasks))
+        
+        completed = []
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(run, index, period, section_value)
+                           for index, (period, section_value) in enumerate(tasks, 1)]
+                for future in as_completed(futures):
+                    index, result = future.result()
+                    if result:
+                        completed.append((index, result))
+        finally:
+            for scraper in scrapers:
+                scraper.close()
+        
+        return [result for _, result in sorted(completed, key=lambda item: item[0])]
+    
+    def download_all(self, years: int = 5, sections: List[str] = None, workers: int = 1,
+                     use_cache: bool = True, refresh: bool = False):
         """
         Download data for multiple years and sections.
         
         Args:
             years: Number of years to download
             sections: List of section values to download (default: [None] for all sections)
+            workers: Number of parallel browser sessions
+            use_cache: Reuse existing files for closed periods and recent downloads of open ones
+            refresh: Refetch open periods even if downloaded within CACHE_TTL
         """
         if sections is None:
             sections = [None]  # None means download ALL sections in one file
         
         periods = self.DATE_PERIODS[:years]
+        total = len(periods) * len(sections)
         results = []
+        tasks = []
         
-        try:
-            self.setup_driver()
-            
-            total = len(periods) * len(sections)
-            current = 0
-            
-            for period in periods:
-                for section_value in sections:
-                    current += 1
-                    section_name = self.SECTIONS.get(section_value, "All Sections") if section_value else "All Sections"
-                    
-                    logger.info(f"\n{'='*60}")
-                    logger.info(f"Downloading {current}/{total}: {period} - {section_name}")
-                    logger.info(f"{'='*60}")
-                    
-                    file_path = self.download_data(period, section_value)
-                    
-                    if file_path:
+        previous = self._load_download_metadata() if use_cache else {}
+        
+        # Listings for closed periods never change, so existing files are final;
+        # open periods are reused while their last download is within CACHE_TTL
+        for period in periods:
+            for section_value in sections:
+                final_path = self._output_path(period, section_value)
+                section_name = self.SECTION_NAMES.get(section_value or None, f"Section {section_value}")
+                
+                if use_cache and final_path.exists():
+                    if self._is_period_closed(period):
+                        logger.info(f"Using cached file for closed period: {final_path}")
                         results.append({
                             'period': period,
                             'section': section_name,
-                            'file': file_path,
-                            'timestamp': datetime.now().isoformat()
+                            'file': str(final_path),
+                            'timestamp': datetime.fromtimestamp(final_path.stat().st_mtime).isoformat()
                         })
-                        logger.info(f"✓ Success: {file_path}")
-                    else:
-                        logger.error(f"✗ Failed: {period} - {section_name}")
+                        continue
                     
-                    # Delay between downloads
-                    time.sleep(3)
+                    entry = previous.get((period, section_name))
+                    if (not refresh and entry
+                            and datetime.now() - datetime.fromisoformat(entry['timestamp']) < self.CACHE_TTL):
+                        logger.info(f"Using recent download: {final_path}")
+                        results.append(entry)
+                        continue
+                
+                tasks.append((period, section_value))
+        
+        try:
+            if workers > 1 and len(tasks) > 1:
+                results.extend(self._download_parallel(tasks, workers))
+            elif tasks:
+                for index, (period, section_value) in enumerate(tasks, 1):
+                    result = self.download_one(period, section_value, index, len(tasks))
+                    if result:
+                        results.append(result)
             
             # Save metadata
-            metadata_file = self.download_dir / "download_metadata.json"
-            with open(metadata_file, 'w') as f:
-                json.dump({
-                    'downloads': results,
-                    'last_update': datetime.now().isoformat(),
-                    'total_files': len(results)
-                }, f, indent=2)
+            self._write_json(self.download_dir / "download_metadata.json", {
+                'downloads': results,
+                'last_update': datetime.now().isoformat(),
+                'total_files': len(results)
+            })
             
             logger.info(f"\n{'='*60}")
             logger.info(f"DOWNLOAD COMPLETE")
@@ -385,14 +914,41 @@ class JOEWorkingScraper:
             logger.info(f"{'='*60}")
             
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.close()
     
-    def test_download(self):
+    def close(self):
+        """Shut down the browser, download observer and HTTP session."""
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            self.wait = None
+        if self.session:
+            self.session.close()
+            self.session = None
+    
+    @staticmethod
+    def _count_rows(file_path: str) -> int:
+        """Count data rows in a workbook without loading its cells."""
+        try:
+            from python_calamine import CalamineWorkbook
+            # Close the file promptly; Windows won't move or delete it while open
+            with CalamineWorkbook.from_path(file_path) as workbook:
+                return max(workbook.get_sheet_by_index(0).height - 1, 0)
+        except ImportError:
+            from openpyxl import load_workbook
+            workbook = load_workbook(file_path, read_only=True)
+            try:
+                return max(workbook.active.max_row - 1, 0)
+            finally:
+                workbook.close()
+    
+    def test_download(self, validate: bool = False):
         """Test downloading a single file."""
         try:
-            self.setup_driver()
-            
             # Test with current period, ALL sections
             period = self.DATE_PERIODS[0]
             section_value = None  # None means ALL sections
@@ -411,9 +967,12 @@ class JOEWorkingScraper:
                 
                 # Try reading it
                 try:
-                    df = pd.read_excel(file_path)
-                    logger.info(f"File contains {len(df)} listings")
-                    logger.info(f"Columns: {', '.join(df.columns[:5])}...")
+                    if validate:
+                        df = pd.read_excel(file_path, engine="calamine")
+                        logger.info(f"File contains {len(df)} listings")
+                        logger.info(f"Columns: {', '.join(df.columns[:5])}...")
+                    else:
+                        logger.info(f"File contains {self._count_rows(file_path)} listings")
                 except Exception as e:
                     logger.warning(f"Could not read Excel file: {e}")
                 
@@ -423,8 +982,7 @@ class JOEWorkingScraper:
                 return False
                 
         finally:
-            if self.driver:
-                self.driver.quit()
+            self.close()
 
 
 def main():
@@ -434,22 +992,27 @@ def main():
     parser = argparse.ArgumentParser(description='Working JOE Scraper')
     parser.add_argument('--test', action='store_true', help='Run test download')
     parser.add_argument('--headless', action='store_true', help='Run in headless mode')
+    parser.add_argument('--validate', action='store_true', help='Fully parse the test download')
     parser.add_argument('--years', type=int, default=5, help='Number of years to download')
     parser.add_argument('--all-sections', action='store_true', help='Download all sections')
+    parser.add_argument('--workers', type=int, default=1, help='Number of parallel browser sessions')
+    parser.add_argument('--no-cache', action='store_true', help='Re-download every period, including closed ones')
+    parser.add_argument('--refresh-cache', action='store_true', help='Re-download open periods even if fetched recently')
     
     args = parser.parse_args()
     
     scraper = JOEWorkingScraper(headless=args.headless)
     
     if args.test:
-        success = scraper.test_download()
+        success = scraper.test_download(validate=args.validate)
         sys.exit(0 if success else 1)
     else:
         sections = None
         if args.all_sections:
             sections = ["1", "2", "5", "6", "9", "10"]  # All main sections
         
-        scraper.download_all(years=args.years, sections=sections)
+        scraper.download_all(years=args.years, sections=sections, workers=args.workers,
+                             use_cache=not args.no_cache, refresh=args.refresh_cache)
 
 
 if __name__ == "__main__":
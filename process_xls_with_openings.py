@@ -6,78 +6,155 @@ from matplotlib.ticker import MultipleLocator
 import numpy as np
 from datetime import datetime
 import os
-from glob import glob
-import re
+from glob import glob, escape as glob_escape
+import tempfile
+import hashlib
+import inspect
+import concurrent.futures
 
-def extract_position_count(row):
-    """Extract the number of positions from title and full text."""
-    
-    # Default to 1 position
-    count = 1
-    
-    # Check title first
-    title = str(row.get('jp_title', '')).lower()
-    
-    # Direct number patterns in title
-    number_patterns = [
-        (r'\((\d+) positions?\)', 1),  # (4 positions)
-        (r'(\d+) tenure[- ]?track position', 1),  # 2 tenure-track positions
-        (r'(\d+) position', 1),  # 3 positions
-        (r'\btwo\b', 2),
-        (r'\bthree\b', 3),
-        (r'\bfour\b', 4),
-        (r'\bfive\b', 5),
-        (r'\bsix\b', 6),
-        (r'\bseveral\b', 3),  # Conservative estimate
-        (r'\bmultiple\b', 2),  # Conservative estimate
-    ]
-    
-    for pattern, value in number_patterns:
-        match = re.search(pattern, title)
-        if match:
-            if isinstance(value, int):
-                count = value
-            else:
-                count = int(match.group(1))
-            break
-    
-    # If no match in title, check full text for explicit mentions
-    if count == 1:
-        full_text = str(row.get('jp_full_text', '')).lower()
-        
-        # More specific patterns for full text
-        text_patterns = [
-            (r'we (?:are|have) (\d+) (?:openings|positions|vacancies)', 1),
-            (r'(\d+) tenure[- ]?track positions?', 1),
-            (r'hiring (\d+) (?:assistant|associate|full)', 1),
-            (r'invites applications for (\d+)', 1),
-            (r'we seek (\d+)', 1),
-            (r'recruiting (\d+)', 1),
-            (r'we (?:are|have) two', 2),
-            (r'we (?:are|have) three', 3),
-            (r'we (?:are|have) four', 4),
-            (r'we (?:are|have) five', 5),
-        ]
-        
-        for pattern, value in text_patterns:
-            match = re.search(pattern, full_text[:1000])  # Check first 1000 chars
-            if match:
-                if isinstance(value, int):
-                    count = value
-                else:
-                    try:
-                        count = int(match.group(1))
-                    except:
-                        count = 1
-                break
-    
-    # Cap at reasonable number
-    return min(count, 10)
+# Columns the pipeline and dashboard use; the rest of the export is never read
+LISTING_COLUMNS = {'jp_title', 'jp_full_text', 'jp_institution', 'jp_section', 'Date_Active'}
 
-def process_xls_files():
-    """Process XLS files with date_active field for accurate week-by-week visualization."""
+# Long free-text columns are kept as packed Arrow strings for the .str scans
+TEXT_COLUMNS = ['jp_title', 'jp_full_text']
+TEXT_DTYPE = 'string[pyarrow]'
+
+# Direct number patterns in title, in priority order
+_TITLE_PATTERNS = [
+    (r'\(\d+ positions?\)', 1),  # (4 positions)
+    (r'\d+ tenure[- ]?track position', 1),  # 2 tenure-track positions
+    (r'\d+ position', 1),  # 3 positions
+    (r'\btwo\b', 2),
+    (r'\bthree\b', 3),
+    (r'\bfour\b', 4),
+    (r'\bfive\b', 5),
+    (r'\bsix\b', 6),
+    (r'\bseveral\b', 3),  # Conservative estimate
+    (r'\bmultiple\b', 2),  # Conservative estimate
+]
+
+# More specific patterns for full text, in priority order
+_TEXT_PATTERNS = [
+    (r'we (?:are|have) \d+ (?:openings|positions|vacancies)', 1),
+    (r'\d+ tenure[- ]?track positions?', 1),
+    (r'hiring \d+ (?:assistant|associate|full)', 1),
+    (r'invites applications for \d+', 1),
+    (r'we seek \d+', 1),
+    (r'recruiting \d+', 1),
+    (r'we (?:are|have) two', 2),
+    (r'we (?:are|have) three', 3),
+    (r'we (?:are|have) four', 4),
+    (r'we (?:are|have) five', 5),
+]
+
+# Every full-text pattern contains one of these phrases; texts without any skip the detailed pass
+_TEXT_GATE = r'position|openings|vacancies|hiring|invites applications|we seek|recruiting|we (?:are|have)'
+
+def _first_pattern_values(text, patterns, default=1):
+    """Value of the first pattern (in list order) matching each string, else default."""
+    
+    # Reposts repeat the same strings, so match each distinct value once and map back
+    codes, uniques = pd.factorize(text)
+    distinct = pd.Series(uniques, dtype=text.dtype)
+    conditions = [distinct.str.contains(pattern).to_numpy(dtype=bool) for pattern, _ in patterns]
+    return np.select(conditions, [value for _, value in patterns], default=default)[codes]
+
+def _lower_text(df, column):
+    """Lowercased Arrow-backed string view of a column, '' where missing."""
+    
+    if column not in df.columns:
+        return pd.Series('', index=df.index, dtype=TEXT_DTYPE)
+    return df[column].astype(TEXT_DTYPE).fillna('').str.lower()
+
+def count_positions(df):
+    """Extract the number of positions per posting from title and full text."""
+    
+    # Check title first; default to 1 position
+    counts = _first_pattern_values(_lower_text(df, 'jp_title'), _TITLE_PATTERNS)
+    
+    # If no count in title, check full text for explicit mentions
+    undecided = counts == 1
+    if undecided.any():
+        full_text = _lower_text(df[undecided], 'jp_full_text').str.slice(0, 1000)  # Check first 1000 chars
+        gated = full_text.str.contains(_TEXT_GATE).to_numpy(dtype=bool)
+        counts[np.flatnonzero(undecided)[gated]] = _first_pattern_values(full_text[gated], _TEXT_PATTERNS)
+    
+    # Cap at reasonable number, which also fits int8
+    return pd.Series(np.minimum(counts, 10), index=df.index, dtype=np.int8)
+
+# Cached Parquet copies carry their position counts, so their file name is keyed on
+# everything that produced them: the pattern tables hash in automatically, and
+# LISTINGS_CACHE_SCHEMA must be bumped whenever count_positions or the load logic changes
+LISTINGS_CACHE_SCHEMA = 1
+LISTINGS_CACHE_VERSION = hashlib.sha256(repr((
+    LISTINGS_CACHE_SCHEMA, sorted(LISTING_COLUMNS), TEXT_DTYPE,
+    _TITLE_PATTERNS, _TEXT_PATTERNS, _TEXT_GATE,
+)).encode()).hexdigest()[:12]
+
+def _parquet_path(file_path):
+    """Path of the Parquet copy kept next to a JOE XLS export for the current counting rules."""
+    
+    return os.path.splitext(file_path)[0] + f'.listings-{LISTINGS_CACHE_VERSION}.parquet'
+
+def has_current_parquet(file_path):
+    """Whether the Parquet copy of a JOE XLS export exists and is at least as new as it."""
+    
+    parquet_path = _parquet_path(file_path)
+    return os.path.exists(parquet_path) and os.path.getmtime(parquet_path) >= os.path.getmtime(file_path)
+
+def _write_parquet(df, parquet_path):
+    """Write a Parquet copy atomically and remove copies left by older counting rules."""
+    
+    # A unique temp name per writer, so concurrent loads never see a half-written file
+    fd, temp_path = tempfile.mkstemp(suffix='.parquet.tmp', dir=os.path.dirname(parquet_path) or '.')
+    os.close(fd)
+    try:
+        df.to_parquet(temp_path, compression='zstd')
+        os.replace(temp_path, parquet_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    
+    stem = parquet_path[:-len(f'.listings-{LISTINGS_CACHE_VERSION}.parquet')]
+    stale = glob(glob_escape(stem) + '.listings-*.parquet') + glob(glob_escape(stem) + '.parquet')
+    for old_path in stale:
+        if old_path != parquet_path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+def load_listings(file_path):
+    """Load a JOE XLS export with position counts, preferring an up-to-date Parquet copy next to it."""
+    
+    parquet_path = _parquet_path(file_path)
+    if has_current_parquet(file_path):
+        try:
+            return pd.read_parquet(parquet_path)
+        except Exception as e:
+            # Unreadable copy (e.g. left by a crash before writes were atomic); rebuild it
+            print(f"  Ignoring unreadable {os.path.basename(parquet_path)}: {e}")
+    
+    df = pd.read_excel(file_path, engine='calamine', usecols=lambda column: column in LISTING_COLUMNS)
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype(TEXT_DTYPE)
+    
+    # Extract position counts once per file; they are cached with the listings
+    df['position_count'] = count_positions(df)
+    
+    # Cache a columnar copy so later runs skip the Excel parse and the regex pass
+    try:
+        _write_parquet(df, parquet_path)
+    except Exception as e:
+        print(f"  Could not cache {os.path.basename(parquet_path)}: {e}")
+    
+    return df
+
+def find_xls_files():
+    """Return the sorted XLS files from the main directory and its scraped subdirectory."""
     
-    # Find all XLS files in both main directory and scraped subdirectory
     xls_dir = '/Users/davidvandijcke/University of Michigan Dropbox/David Van Dijcke/job_market/tracker/joe_data/'
     
     # Get files from main directory
@@ -88,17 +165,33 @@ def process_xls_files():
     if os.path.exists(scraped_dir):
         xls_files.extend(glob(os.path.join(scraped_dir, '*.xlsx')))
     
+    return sorted(xls_files)
+
+def process_xls_files():
+    """Process XLS files with date_active field for accurate week-by-week visualization."""
+    
+    # Find all XLS files in both main directory and scraped subdirectory
+    xls_files = find_xls_files()
+    
     print("Processing XLS files - Counting Job OPENINGS (not just postings)")
     print("=" * 70)
     
     all_data = []
     
-    for file_path in sorted(xls_files):
+    # Only workbooks without a current Parquet copy are worth a worker process;
+    # cached copies load faster in-process than a pool can start and return them
+    stale_files = [file_path for file_path in xls_files if not has_current_parquet(file_path)]
+    parsed = {}
+    if len(stale_files) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(len(stale_files), os.cpu_count() or 1)) as executor:
+            parsed = dict(zip(stale_files, executor.map(load_listings, stale_files)))
+    
+    for file_path in xls_files:
         filename = os.path.basename(file_path)
         print(f"\nReading {filename}")
         
-        # Read the Excel file
-        df = pd.read_excel(file_path)
+        # Read the Excel file (or its cached Parquet copy)
+        df = parsed[file_path] if file_path in parsed else load_listings(file_path)
         
         # Add to collection
         df['source_file'] = filename
@@ -114,9 +207,14 @@ def process_xls_files():
     full_df = pd.concat(all_data, ignore_index=True)
     print(f"\nTotal postings across all files: {len(full_df)}")
     
-    # Extract position counts
-    print("\nExtracting position counts from postings...")
-    full_df['position_count'] = full_df.apply(extract_position_count, axis=1)
+    # Sections, institutions and file names repeat across thousands of rows
+    for col in ['jp_section', 'jp_institution', 'source_file']:
+        full_df[col] = full_df[col].astype('category')
+    
+    # Flag US Academic postings once, testing the handful of section labels rather than every row
+    sections = full_df['jp_section']
+    us_sections = [label for label in sections.cat.categories if 'us: full-time academic' in str(label).lower()]
+    full_df['is_us_academic'] = sections.isin(us_sections)
     
     # Show statistics
     multi_position = full_df[full_df['position_count'] > 1]
@@ -156,13 +254,13 @@ def analyze_date_fields(df):
     df = df[valid_dates].copy()
     
     # Calculate ISO week and year
-    df['iso_year'] = df['Date_Active'].dt.isocalendar().year
-    df['iso_week'] = df['Date_Active'].dt.isocalendar().week
+    dates = df['Date_Active'].dt
+    iso = dates.isocalendar()
+    df['iso_year'] = iso['year'].astype(np.int16)
+    df['iso_week'] = iso['week'].astype(np.int8)
     
     # Add academic year (August to July)
-    df['academic_year'] = df['Date_Active'].apply(
-        lambda x: x.year if x.month >= 8 else x.year - 1
-    )
+    df['academic_year'] = (dates.year - (dates.month < 8)).astype(np.int16)
     
     print(f"\nDate range: {df['Date_Active'].min()} to {df['Date_Active'].max()}")
     print(f"ISO weeks range: {df['iso_week'].min()} to {df['iso_week'].max()}")
@@ -178,7 +276,7 @@ def filter_us_academic(df):
     print("=" * 70)
     
     # Filter for US Academic
-    us_academic = df[df['jp_section'].str.contains('US: Full-Time Academic', na=False, case=False)]
+    us_academic = df[df['is_us_academic']]
     
     print(f"US Academic postings: {len(us_academic)}")
     print(f"US Academic OPENINGS: {us_academic['position_count'].sum()}")
@@ -192,42 +290,52 @@ def create_weekly_cumulative(df):
     print("Creating weekly cumulative OPENING counts")
     print("=" * 70)
     
-    # Group by academic year and ISO week
+    # Count OPENINGS (not postings) by ISO week, one column per academic year,
+    # then accumulate from week 30 onwards
+    weeks = range(30, 58)
+    cumulative_by_year = (
+        df.groupby(['academic_year', 'iso_week'])['position_count'].sum()
+        .unstack('academic_year', fill_value=0)
+        .reindex(weeks, fill_value=0)
+        .cumsum()
+    )
+    postings_by_year = df['academic_year'].value_counts()
+    
     weekly_data = {}
     
-    for ac_year in sorted(df['academic_year'].unique()):
-        year_data = df[df['academic_year'] == ac_year]
-        
-        # Count OPENINGS (not postings) by ISO week
-        week_openings = year_data.groupby('iso_week')['position_count'].sum()
-        
-        # Create cumulative from week 30 onwards
-        weeks = range(30, 58)
-        cumulative = []
-        total_so_far = 0
-        
-        for week in weeks:
-            if week in week_openings.index:
-                total_so_far += week_openings[week]
-            cumulative.append(total_so_far)
+    for ac_year in sorted(cumulative_by_year.columns):
+        cumulative = cumulative_by_year[ac_year].tolist()
+        total_so_far = cumulative[-1]
+        postings = int(postings_by_year[ac_year])
         
         weekly_data[ac_year] = {
             'weeks': list(weeks),
             'cumulative': cumulative,
             'total': total_so_far,
-            'postings': len(year_data)
+            'postings': postings
         }
         
         print(f"Academic year {ac_year}-{ac_year+1}:")
         print(f"  Total OPENINGS: {total_so_far}")
-        print(f"  Total postings: {len(year_data)}")
-        print(f"  Avg openings/posting: {total_so_far/len(year_data) if len(year_data) > 0 else 0:.2f}")
+        print(f"  Total postings: {postings}")
+        print(f"  Avg openings/posting: {total_so_far/postings if postings > 0 else 0:.2f}")
         print(f"  Week 30-35 openings: {cumulative[5] if len(cumulative) > 5 else 0}")
         print(f"  Week 48 openings: {cumulative[18] if len(cumulative) > 18 else 0}")
     
     return weekly_data
 
-def create_aea_visualization(weekly_data):
+def weekly_data_fingerprint(weekly_data, dpi=150):
+    """Return a stable hash of the weekly data used for the plot and of how it is drawn."""
+    
+    payload = repr(sorted(
+        (int(year), [int(c) for c in data['cumulative']], int(data['postings']))
+        for year, data in weekly_data.items()
+    ))
+    # Salt with the plotting code and its options, so chart changes also trigger a redraw
+    payload += repr((inspect.getsource(create_aea_visualization), dpi))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def create_aea_visualization(weekly_data, dpi=150):
     """Create visualization following exact AEA methodology."""
     
     print("\n" + "=" * 70)
@@ -378,9 +486,10 @@ def create_aea_visualization(weekly_data):
     
     plt.tight_layout()
     plt.savefig('joe_openings_plot.png',
-                dpi=150,
+                dpi=dpi,
                 facecolor='#1a1a1a',
-                edgecolor='none')
+                edgecolor='none',
+                pil_kwargs={'compress_level': 1})  # Fast zlib level; encoding dominates the save
     
     print("\n✅ Saved visualization as 'joe_openings_plot.png'")
 
@@ -403,8 +512,23 @@ def main():
     # Create weekly cumulative data
     weekly_data = create_weekly_cumulative(df)
     
-    # Create visualization
-    create_aea_visualization(weekly_data)
+    # Create visualization, unless the plotted data is unchanged since last run
+    plot_path = 'joe_openings_plot.png'
+    plot_dpi = 150
+    fingerprint_path = plot_path + '.sha256'
+    fingerprint = weekly_data_fingerprint(weekly_data, dpi=plot_dpi)
+    
+    previous = None
+    if os.path.exists(plot_path) and os.path.exists(fingerprint_path):
+        with open(fingerprint_path) as f:
+            previous = f.read().strip()
+    
+    if fingerprint == previous:
+        print("\nNo new openings since last run; skipping visualization")
+    else:
+        create_aea_visualization(weekly_data, dpi=plot_dpi)
+        with open(fingerprint_path, 'w') as f:
+            f.write(fingerprint)
     
     print("\n" + "=" * 70)
     print("Processing complete!")
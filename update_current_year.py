@@ -4,11 +4,34 @@ Update only the current year's data while preserving historical data.
 This is used by GitHub Actions to update without re-scraping all years.
 """
 
+import hashlib
 import json
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 from generate_static_site import generate_data_json
+from process_xls_with_openings import find_xls_files
+
+# Code that shapes joe_data.json; editing any of it invalidates the skip fingerprint
+PROCESSING_SOURCES = ['process_xls_with_openings.py', 'generate_static_site.py', 'update_current_year.py']
+
+def inputs_fingerprint(current_year):
+    """Hash the Excel inputs by name and content, the processing code, and the year being refreshed.
+    
+    Content rather than mtime, since a fresh checkout resets every mtime.
+    """
+    
+    digest = hashlib.blake2b(str(current_year).encode())
+    source_dir = Path(__file__).resolve().parent
+    for source in PROCESSING_SOURCES:
+        digest.update((source_dir / source).read_bytes())
+    for file_path in find_xls_files():
+        digest.update(os.path.basename(file_path).encode())
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
 
 def update_current_year_only():
     """Update only current year data while preserving historical."""
@@ -16,6 +39,17 @@ def update_current_year_only():
     # Load existing data
     docs_path = Path('docs')
     data_file = docs_path / 'joe_data.json'
+    fingerprint_file = docs_path / '.joe_data.fingerprint'
+
+    # Get current academic year
+    current_date = datetime.now()
+    current_year = current_date.year if current_date.month >= 7 else current_date.year - 1
+
+    # Skip the Excel processing entirely when no input changed since the last update
+    fingerprint = inputs_fingerprint(current_year)
+    if data_file.exists() and fingerprint_file.exists() and fingerprint_file.read_text().strip() == fingerprint:
+        print("No changes in Excel inputs; skipping update")
+        return
 
     existing_data = {}
     if data_file.exists():
@@ -30,10 +64,6 @@ def update_current_year_only():
     # Generate new data (this will include whatever Excel files are present)
     new_data = generate_data_json()
 
-    # Get current academic year
-    current_date = datetime.now()
-    current_year = current_date.year if current_date.month >= 7 else current_date.year - 1
-
     # Merge data: preserve all historical years, update current year
     if 'sections' not in existing_data:
         existing_data['sections'] = {}
@@ -52,16 +82,24 @@ def update_current_year_only():
             print(f"Updated {section_name} for year {current_year}")
 
     # Recalculate total postings
-    total_postings = 0
-    for section_data in existing_data['sections'].values():
-        for year_data in section_data.values():
-            total_postings += year_data.get('postings', 0)
+    total_postings = sum(
+        year_data.get('postings', 0)
+        for section_data in existing_data['sections'].values()
+        for year_data in section_data.values()
+    )
 
     existing_data['metadata']['total_postings'] = total_postings
 
-    # Save merged data
-    with open(data_file, 'w') as f:
+    # Save merged data atomically, so a failed write never leaves a truncated file behind
+    tmp_data_file = data_file.with_name(data_file.name + '.tmp')
+    with open(tmp_data_file, 'w', buffering=1 << 20) as f:
         json.dump(existing_data, f, separators=(',', ':'))
+    os.replace(tmp_data_file, data_file)
+
+    # Record the inputs this data was built from
+    tmp_fingerprint = fingerprint_file.with_name(fingerprint_file.name + '.tmp')
+    tmp_fingerprint.write_text(fingerprint)
+    os.replace(tmp_fingerprint, fingerprint_file)
 
     print(f"Updated joe_data.json with {total_postings} total postings")
     print(f"Sections in final data: {list(existing_data['sections'].keys())}")